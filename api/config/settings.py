@@ -1,15 +1,63 @@
+"""
+Configuración de la aplicación
+"""
 from pydantic_settings import BaseSettings
+from pydantic import Field
+from typing import List
+from functools import lru_cache
 
-class Settings(BaseSettings):
-    PROJECT_NAME: str = "MundoNegocio API"
-    DATABASE_URL: str | None = None
-    REDIS_URL: str | None = None
-    SECRET_KEY: str = "super-secret-key"
-    ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+class Settings(BaseSettings):
+    """Settings de la aplicación"""
+    
+    # App
+    app_name: str = "Mundo Negocio Dashboard API"
+    app_version: str = "6.0.0"
+    debug: bool = False
+    environment: str = "production"
+    log_level: str = "INFO"
+    log_sample_rate: float = 1.0  # Fracción de requests exitosas que se loguean
+    
+    # Database
+    database_url: str = Field(default="postgresql://localhost/mundonegocio")
+    
+    # Redis
+    redis_url: str = Field(default="redis://localhost:6379")
+    
+    # Revocación de refresh tokens (requiere Redis)
+    token_revocation_enabled: bool = False
+    token_revocation_fail_closed: bool = False  # Rechazar refresh si Redis no responde
+    
+    # JWT
+    jwt_secret_key: str = Field(default="change-this-to-a-secure-secret-key-min-32-chars")
+    jwt_algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 7
+    
+    # CORS
+    cors_origins: List[str] = Field(
+        default=[
+            "http://localhost:3000",
+            "http://localhost:3001",
+            "http://localhost:3002",
+            "https://localhost:3000"
+        ]
+    )
+    
+    # Rate Limiting
+    rate_limit_per_minute: int = 60
+    
+    # Cache
+    cache_ttl_seconds: int = 300
+    
     class Config:
         env_file = ".env"
+        case_sensitive = False
+
 
-def get_settings():
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get settings singleton
+    """
     return Settings()
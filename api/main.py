@@ -4,8 +4,8 @@ FastAPI Application with Authentication, Rate Limiting, Monitoring
 """
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from brotli_asgi import BrotliMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -13,14 +13,14 @@ from slowapi.errors import RateLimitExceeded
 from prometheus_fastapi_instrumentator import Instrumentator
 import logging
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 import structlog
 
 from api.config.settings import get_settings
 from api.routes import sales, auth, filters, exports, health
 from middleware.auth import AuthMiddleware
 from middleware.logging import LoggingMiddleware
-from middleware.error_handler import error_handler_middleware
+from middleware.error_handler import ErrorHandlerMiddleware
 from utils.database import init_db, close_db
 
 # Configuración
@@ -60,6 +60,7 @@ app = FastAPI(
     docs_url="/api/docs" if settings.debug else None,
     redoc_url="/api/redoc" if settings.debug else None,
     openapi_url="/api/openapi.json" if settings.debug else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Agregar rate limiter al estado de la app
@@ -77,14 +78,15 @@ app.add_middleware(
     expose_headers=["X-Request-ID", "X-Rate-Limit-Remaining"],
 )
 
-# 2. GZip Compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# 2. Compresión Brotli (gzip como fallback para clientes sin "br").
+# minimum_size=1500 deja fuera respuestas pequeñas como /health
+app.add_middleware(BrotliMiddleware, minimum_size=1500, quality=4, gzip_fallback=True)
 
 # 3. Custom Logging
-app.middleware("http")(LoggingMiddleware())
+app.add_middleware(LoggingMiddleware)
 
 # 4. Custom Error Handler
-app.middleware("http")(error_handler_middleware)
+app.add_middleware(ErrorHandlerMiddleware)
 
 # 5. Authentication (para rutas protegidas)
 # app.middleware("http")(AuthMiddleware())  # Se activa selectivamente por ruta
@@ -131,13 +133,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         body=exc.body
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error_code": "VALIDATION_ERROR",
             "message": "Error de validación en los datos enviados",
             "details": exc.errors(),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
     )
 
@@ -151,12 +153,12 @@ async def general_exception_handler(request: Request, exc: Exception):
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error_code": "INTERNAL_SERVER_ERROR",
             "message": "Error interno del servidor" if not settings.debug else str(exc),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
     )
 
@@ -172,7 +174,7 @@ async def root(request: Request):
         "environment": settings.environment,
         "docs": "/api/docs" if settings.debug else "disabled",
         "health": "/health",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
 
 # Incluir routers
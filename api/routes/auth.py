@@ -1,17 +1,25 @@
 """
 Sistema de Autenticación JWT con refresh tokens
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-from datetime import datetime, timedelta
-from jose import JWTError, jwt
+from datetime import timedelta
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from passlib.context import CryptContext
+from collections import OrderedDict
+import hashlib
 import secrets
+import time
+import uuid
 from typing import Optional
+from redis.exceptions import RedisError
 import structlog
 
-from config.settings import get_settings
+from api.config.settings import get_settings
+from utils.token_revocation import is_jti_revoked, revoke_jti
 
 settings = get_settings()
 logger = structlog.get_logger()
@@ -19,8 +27,11 @@ logger = structlog.get_logger()
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 security = HTTPBearer()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing - Argon2id (perfil OWASP: 46 MiB, t=2, p=1)
+password_hasher = PasswordHasher(time_cost=2, memory_cost=46 * 1024, parallelism=1)
+
+# passlib solo se mantiene para verificar hashes bcrypt existentes
+legacy_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Modelos inline
 class User(BaseModel):
@@ -51,32 +62,70 @@ class ChangePasswordRequest(BaseModel):
 
 # Funciones de utilidad
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verificar password"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verificar password (Argon2id o bcrypt legado)"""
+    if legacy_pwd_context.identify(hashed_password):
+        return legacy_pwd_context.verify(plain_password, hashed_password)
+    
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 def get_password_hash(password: str) -> str:
-    """Hash password"""
-    return pwd_context.hash(password)
+    """Hash password con Argon2id"""
+    return password_hasher.hash(password)
+
+# TODO: Buscar usuario en base de datos
+# Por ahora, usuarios hardcodeados para demo. Los hashes se calculan una sola
+# vez al importar el módulo en lugar de en cada request de login, y los emails
+# se indexan en minúsculas.
+_USERS_DB = {
+    user["email"].lower(): user
+    for user in [
+        {
+            "id": "1",
+            "email": "admin@mundonegocio.com",
+            "hashed_password": get_password_hash("admin123"),
+            "full_name": "Administrador Sistema",
+            "role": "admin",
+            "country": "peru",
+            "is_active": True
+        },
+        {
+            "id": "2",
+            "email": "vendedor@mundonegocio.com",
+            "hashed_password": get_password_hash("vendedor123"),
+            "full_name": "Vendedor Demo",
+            "role": "user",
+            "country": "peru",
+            "is_active": True
+        }
+    ]
+}
+
+# Hash usado cuando el email no existe, para mantener el tiempo constante
+_DUMMY_PASSWORD_HASH = get_password_hash(secrets.token_urlsafe(16))
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Crear JWT access token"""
     to_encode = data.copy()
+    now = int(time.time())
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+        expire = now + settings.access_token_expire_minutes * 60
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
+        "iat": now,
         "type": "access"
     })
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.secret_key,
-        algorithm=settings.algorithm
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm
     )
     
     return encoded_jwt
@@ -84,33 +133,67 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 def create_refresh_token(data: dict) -> str:
     """Crear refresh token"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=30)  # 30 días
+    now = int(time.time())
+    expire = now + 30 * 24 * 60 * 60  # 30 días
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
+        "iat": now,
         "type": "refresh",
-        "jti": secrets.token_urlsafe(32)  # Unique identifier
+        "jti": uuid.uuid4().hex  # Unique identifier
     })
     
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.secret_key,
-        algorithm=settings.algorithm
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm
     )
     
     return encoded_jwt
 
+# Cache de tokens decodificados (LRU + TTL, acotado por el "exp" del token)
+_TOKEN_CACHE_MAXSIZE = 10_000
+_TOKEN_CACHE_TTL_SECONDS = 60
+_token_cache: "OrderedDict[tuple, tuple[dict, float]]" = OrderedDict()
+
+# Digest de la llave de firma; los settings están cacheados, así que no cambia
+# durante la vida del proceso
+_SECRET_KEY_DIGEST = hashlib.blake2b(settings.jwt_secret_key.encode(), digest_size=16).digest()
+
+def _token_cache_key(token: str) -> tuple:
+    """Clave compacta del token; incluye la llave de firma para invalidar al rotarla"""
+    return (_SECRET_KEY_DIGEST, hashlib.blake2b(token.encode(), digest_size=16).digest())
+
 def decode_token(token: str) -> dict:
     """Decodificar y validar token"""
+    now = time.time()
+    cache_key = _token_cache_key(token)
+    
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        payload, expires_at = cached
+        if expires_at > now:
+            _token_cache.move_to_end(cache_key)
+            return dict(payload)
+        _token_cache.pop(cache_key, None)
+    
     try:
         payload = jwt.decode(
             token,
-            settings.secret_key,
-            algorithms=[settings.algorithm]
+            settings.jwt_secret_key,
+            algorithms=[settings.jwt_algorithm]
         )
-        return payload
-    except JWTError as e:
+        
+        expires_at = now + _TOKEN_CACHE_TTL_SECONDS
+        if "exp" in payload:
+            expires_at = min(expires_at, payload["exp"])
+        
+        _token_cache[cache_key] = (payload, expires_at)
+        if len(_token_cache) > _TOKEN_CACHE_MAXSIZE:
+            _token_cache.popitem(last=False)
+        
+        return dict(payload)
+    except jwt.InvalidTokenError as e:
         logger.warning("token_decode_failed", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -177,32 +260,14 @@ async def login(login_data: LoginRequest):
     - Email: admin@mundonegocio.com / Password: admin123
     - Email: vendedor@mundonegocio.com / Password: vendedor123
     """
-    # TODO: Buscar usuario en base de datos
-    # Por ahora, usuarios hardcodeados para demo
-    users_db = {
-        "admin@mundonegocio.com": {
-            "id": "1",
-            "email": "admin@mundonegocio.com",
-            "hashed_password": get_password_hash("admin123"),
-            "full_name": "Administrador Sistema",
-            "role": "admin",
-            "country": "peru",
-            "is_active": True
-        },
-        "vendedor@mundonegocio.com": {
-            "id": "2",
-            "email": "vendedor@mundonegocio.com",
-            "hashed_password": get_password_hash("vendedor123"),
-            "full_name": "Vendedor Demo",
-            "role": "user",
-            "country": "peru",
-            "is_active": True
-        }
-    }
+    user_dict = _USERS_DB.get(login_data.email.lower())
     
-    user_dict = users_db.get(login_data.email)
+    # Verificar siempre contra un hash para que el tiempo de respuesta
+    # no revele si el email existe
+    hashed_password = user_dict["hashed_password"] if user_dict else _DUMMY_PASSWORD_HASH
+    password_ok = verify_password(login_data.password, hashed_password)
     
-    if not user_dict or not verify_password(login_data.password, user_dict["hashed_password"]):
+    if not user_dict or not password_ok:
         logger.warning("login_failed", email=login_data.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -229,13 +294,16 @@ async def login(login_data: LoginRequest):
     
     logger.info("login_success", user_id=user_dict["id"], email=user_dict["email"])
     
-    return TokenResponse(
+    token_response = TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer",
         expires_in=settings.access_token_expire_minutes * 60,
         user=User(**{k: v for k, v in user_dict.items() if k != "hashed_password"})
     )
+    
+    # Serializar directo con pydantic-core, sin jsonable_encoder
+    return Response(content=token_response.model_dump_json(), media_type="application/json")
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(refresh_data: RefreshTokenRequest):
@@ -249,9 +317,17 @@ async def refresh_token(refresh_data: RefreshTokenRequest):
             detail="Token type inválido",
         )
     
+    if await is_jti_revoked(payload.get("jti", "")):
+        logger.warning("revoked_refresh_token_used", email=payload.get("sub"))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     email = payload.get("sub")
     
-    # TODO: Buscar usuario en BD y verificar que el refresh token no haya sido revocado
+    # TODO: Buscar usuario en BD
     
     # Crear nuevo access token
     token_data = {
@@ -263,19 +339,42 @@ async def refresh_token(refresh_data: RefreshTokenRequest):
     
     logger.info("token_refreshed", email=email)
     
-    return TokenResponse(
+    token_response = TokenResponse(
         access_token=access_token,
         refresh_token=refresh_data.refresh_token,  # Mantener el mismo refresh token
         token_type="bearer",
         expires_in=settings.access_token_expire_minutes * 60
     )
+    
+    return Response(content=token_response.model_dump_json(), media_type="application/json")
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_active_user)):
+async def logout(
+    logout_data: Optional[RefreshTokenRequest] = None,
+    current_user: User = Depends(get_current_active_user)
+):
     """
     Cerrar sesión (logout)
-    TODO: Agregar refresh token a blacklist en Redis
+    Si se envía el refresh token, se revoca para que no pueda renovarse
     """
+    if logout_data is not None:
+        payload = decode_token(logout_data.refresh_token)
+        
+        if payload.get("type") != "refresh" or payload.get("sub") != current_user.email:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido",
+            )
+        
+        try:
+            await revoke_jti(payload["jti"], payload["exp"])
+        except RedisError as e:
+            logger.error("refresh_token_revoke_failed", user_id=current_user.id, error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="No se pudo revocar el refresh token, intenta nuevamente",
+            )
+    
     logger.info("logout", user_id=current_user.id, email=current_user.email)
     
     return {"message": "Sesión cerrada exitosamente"}
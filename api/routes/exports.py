@@ -2,13 +2,31 @@
 Exports Routes
 """
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response
 import io
 import csv
 
 router = APIRouter(prefix="/api/exports", tags=["Exports"])
 
 
+def _build_demo_csv() -> bytes:
+    """
+    Crear el CSV demo en memoria
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["Producto", "Ventas", "Cantidad"])
+    writer.writerow(["Producto A", "4530000", "8765"])
+    writer.writerow(["Producto B", "3890000", "7543"])
+    writer.writerow(["Producto C", "3210000", "6234"])
+    
+    return output.getvalue().encode("utf-8")
+
+
+# El contenido es fijo, se genera una sola vez al importar el módulo
+_DEMO_CSV = _build_demo_csv()
+
+
 @router.get("/{format}")
 async def export_data(format: str):
     """
@@ -22,18 +40,8 @@ async def export_data(format: str):
     
     # Por ahora, retornar CSV demo
     if format == "csv":
-        # Crear CSV en memoria
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["Producto", "Ventas", "Cantidad"])
-        writer.writerow(["Producto A", "4530000", "8765"])
-        writer.writerow(["Producto B", "3890000", "7543"])
-        writer.writerow(["Producto C", "3210000", "6234"])
-        
-        output.seek(0)
-        
-        return StreamingResponse(
-            iter([output.getvalue()]),
+        return Response(
+            content=_DEMO_CSV,
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=export.csv"}
         )
@@ -1,7 +1,8 @@
 """
 Filters Routes
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+import orjson
 
 router = APIRouter(prefix="/api/filters", tags=["Filters"])
 
@@ -15,10 +16,12 @@ DEMO_FILTERS = {
     }
 }
 
+_FILTERS_JSON = orjson.dumps(DEMO_FILTERS)
 
-@router.get("/options")
+
+@router.get("/options", response_model=None)
 async def get_filter_options():
     """
     Get available filter options
     """
-    return DEMO_FILTERS
+    return Response(content=_FILTERS_JSON, media_type="application/json")
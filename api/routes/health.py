@@ -2,32 +2,33 @@
 Health Check Routes
 """
 from fastapi import APIRouter, status
-from datetime import datetime
+from fastapi.responses import ORJSONResponse
+from datetime import datetime, timezone
 
 router = APIRouter(tags=["Health"])
 
 
-@router.get("/health", status_code=status.HTTP_200_OK)
+@router.get("/health", status_code=status.HTTP_200_OK, response_model=None)
 async def health_check():
     """
     Health check endpoint
     """
-    return {
+    return ORJSONResponse(content={
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "service": "Mundo Negocio Dashboard API",
         "version": "6.0.0"
-    }
+    })
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+@router.get("/", status_code=status.HTTP_200_OK, response_model=None)
 async def root():
     """
     Root endpoint
     """
-    return {
+    return ORJSONResponse(content={
         "message": "Mundo Negocio Dashboard API",
         "version": "6.0.0",
         "docs": "/docs",
         "health": "/health"
-    }
+    })
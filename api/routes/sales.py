@@ -1,14 +1,17 @@
 """
 Sales Routes - Con datos de demostración
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from typing import Optional, List
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 import random
+import orjson
 
 router = APIRouter(prefix="/api/sales", tags=["Sales"])
 
 # Datos demo
+_TODAY = date.today()
+
 DEMO_DATA = {
     "summary": {
         "total_sales": 22650000.00,
@@ -17,7 +20,7 @@ DEMO_DATA = {
         "unique_customers": 8234
     },
     "by_period": [
-        {"date": (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d"), 
+        {"date": (_TODAY - timedelta(days=i)).isoformat(), 
          "sales": random.randint(2000000, 4000000),
          "orders": random.randint(5000, 7000)}
         for i in range(7)
@@ -38,8 +41,32 @@ DEMO_DATA = {
     ]
 }
 
+# Límite máximo aceptado por top-products y by-seller
+MAX_LIMIT = 50
+
+# Respuestas serializadas una sola vez al importar el módulo
+_SUMMARY_JSON = b""
+_BY_PERIOD_JSON = b""
+_TOP_PRODUCTS_JSON: List[bytes] = []
+_BY_SELLER_JSON: List[bytes] = []
+
+
+def refresh_demo_cache():
+    """
+    Serializar DEMO_DATA, incluyendo cada slice posible por limit (índice = limit)
+    """
+    global _SUMMARY_JSON, _BY_PERIOD_JSON, _TOP_PRODUCTS_JSON, _BY_SELLER_JSON
+    
+    _SUMMARY_JSON = orjson.dumps(DEMO_DATA["summary"])
+    _BY_PERIOD_JSON = orjson.dumps(DEMO_DATA["by_period"])
+    _TOP_PRODUCTS_JSON = [orjson.dumps(DEMO_DATA["top_products"][:limit]) for limit in range(MAX_LIMIT + 1)]
+    _BY_SELLER_JSON = [orjson.dumps(DEMO_DATA["by_seller"][:limit]) for limit in range(MAX_LIMIT + 1)]
+
+
+refresh_demo_cache()
+
 
-@router.get("/summary")
+@router.get("/summary", response_model=None)
 async def get_sales_summary(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
@@ -49,10 +76,10 @@ async def get_sales_summary(
     """
     Get sales summary
     """
-    return DEMO_DATA["summary"]
+    return Response(content=_SUMMARY_JSON, media_type="application/json")
 
 
-@router.get("/by-period")
+@router.get("/by-period", response_model=None)
 async def get_sales_by_period(
     period: str = Query("daily", regex="^(daily|weekly|monthly)$"),
     start_date: Optional[str] = Query(None),
@@ -61,28 +88,28 @@ async def get_sales_by_period(
     """
     Get sales by period
     """
-    return DEMO_DATA["by_period"]
+    return Response(content=_BY_PERIOD_JSON, media_type="application/json")
 
 
-@router.get("/top-products")
+@router.get("/top-products", response_model=None)
 async def get_top_products(
-    limit: int = Query(5, ge=1, le=50),
+    limit: int = Query(5, ge=1, le=MAX_LIMIT),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None)
 ):
     """
     Get top products
     """
-    return DEMO_DATA["top_products"][:limit]
+    return Response(content=_TOP_PRODUCTS_JSON[limit], media_type="application/json")
 
 
-@router.get("/by-seller")
+@router.get("/by-seller", response_model=None)
 async def get_sales_by_seller(
-    limit: int = Query(5, ge=1, le=50),
+    limit: int = Query(5, ge=1, le=MAX_LIMIT),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None)
 ):
     """
     Get sales by seller
     """
-    return DEMO_DATA["by_seller"][:limit]
+    return Response(content=_BY_SELLER_JSON[limit], media_type="application/json")
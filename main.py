@@ -4,15 +4,15 @@ FastAPI Application with Authentication, Rate Limiting, Monitoring
 """
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from brotli_asgi import BrotliMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 import logging
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 import structlog
 
 # Prometheus opcional
@@ -24,31 +24,32 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("Prometheus not available, metrics disabled")
 
-from config.settings import get_settings
+from api.config.settings import get_settings
 from api.routes import auth, sales, filters, exports, health
 from middleware.auth import AuthMiddleware
 from middleware.logging import LoggingMiddleware
-from middleware.error_handler import error_handler_middleware
+from middleware.error_handler import ErrorHandlerMiddleware
 from utils.database import init_db, close_db
+from utils.token_revocation import init_token_revocation, close_token_revocation
 
 # Configuración
 settings = get_settings()
 
-# Logging estructurado
+# Logging estructurado - un write() a stdout por registro, filtrado por nivel
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
         structlog.processors.JSONRenderer()
     ],
+    wrapper_class=structlog.make_filtering_bound_logger(
+        logging.getLevelName(settings.log_level.upper())
+    ),
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
+    logger_factory=structlog.PrintLoggerFactory(sys.stdout),
     cache_logger_on_first_use=True,
 )
 
@@ -68,6 +69,7 @@ app = FastAPI(
     docs_url="/api/docs" if settings.debug else None,
     redoc_url="/api/redoc" if settings.debug else None,
     openapi_url="/api/openapi.json" if settings.debug else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Agregar rate limiter al estado de la app
@@ -85,14 +87,15 @@ app.add_middleware(
     expose_headers=["X-Request-ID", "X-Rate-Limit-Remaining"],
 )
 
-# 2. GZip Compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# 2. Compresión Brotli (gzip como fallback para clientes sin "br").
+# minimum_size=1500 deja fuera respuestas pequeñas como /health
+app.add_middleware(BrotliMiddleware, minimum_size=1500, quality=4, gzip_fallback=True)
 
 # 3. Custom Logging
-app.middleware("http")(LoggingMiddleware())
+app.add_middleware(LoggingMiddleware)
 
 # 4. Custom Error Handler
-app.middleware("http")(error_handler_middleware)
+app.add_middleware(ErrorHandlerMiddleware)
 
 # 5. Authentication (para rutas protegidas)
 # app.middleware("http")(AuthMiddleware())  # Se activa selectivamente por ruta
@@ -120,6 +123,9 @@ async def startup_event():
     await init_db()
     
     logger.info("database_initialized")
+    
+    # Cargar refresh tokens revocados
+    await init_token_revocation()
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -128,6 +134,7 @@ async def shutdown_event():
     
     # Cerrar conexiones
     await close_db()
+    await close_token_revocation()
     
     logger.info("connections_closed")
 
@@ -142,13 +149,13 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         body=exc.body
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error_code": "VALIDATION_ERROR",
             "message": "Error de validación en los datos enviados",
             "details": exc.errors(),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
     )
 
@@ -162,29 +169,29 @@ async def general_exception_handler(request: Request, exc: Exception):
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error_code": "INTERNAL_SERVER_ERROR",
             "message": "Error interno del servidor" if not settings.debug else str(exc),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc)
         }
     )
 
 # Routes
-@app.get("/")
+@app.get("/", response_model=None)
 @limiter.limit("30/minute")
 async def root(request: Request):
     """Root endpoint con información del API"""
-    return {
+    return ORJSONResponse(content={
         "app": settings.app_name,
         "version": settings.app_version,
         "status": "operational",
         "environment": settings.environment,
         "docs": "/api/docs" if settings.debug else "disabled",
         "health": "/health",
-        "timestamp": datetime.utcnow().isoformat()
-    }
+        "timestamp": datetime.now(timezone.utc)
+    })
 
 # Incluir routers
 # Health router SIN prefix para que /health funcione
@@ -204,7 +211,9 @@ if __name__ == "__main__":
         port=8000,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
-        access_log=True,
+        access_log=False,  # LoggingMiddleware ya registra cada request
+        loop="uvloop",
+        http="httptools",
         workers=1 if settings.debug else 4,
         proxy_headers=True,
         forwarded_allow_ips="*"
@@ -1,33 +1,56 @@
 """
 Error Handler Middleware
 """
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from fastapi.responses import ORJSONResponse
 import structlog
 
+from api.config.settings import get_settings
+
 logger = structlog.get_logger()
+settings = get_settings()
 
 
-async def error_handler_middleware(request: Request, call_next):
+class ErrorHandlerMiddleware:
     """
-    Middleware para manejo de errores
+    Middleware ASGI para manejo de errores
     """
-    try:
-        response = await call_next(request)
-        return response
-    except Exception as exc:
-        logger.error(
-            "unhandled_error",
-            error=str(exc),
-            path=request.url.path,
-            method=request.method
-        )
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
         
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "detail": "Internal server error",
-                "error": str(exc) if request.app.state.settings.DEBUG else "An error occurred"
-            }
-        )
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            logger.error(
+                "unhandled_error",
+                error=str(exc),
+                path=scope["path"],
+                method=scope["method"]
+            )
+            
+            # Si la respuesta ya empezó no se puede enviar otra
+            if response_started:
+                raise
+            
+            response = ORJSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={
+                    "detail": "Internal server error",
+                    "error": str(exc) if settings.debug else "An error occurred"
+                }
+            )
+            await response(scope, receive, send)
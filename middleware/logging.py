@@ -1,46 +1,58 @@
 """
 Logging Middleware
 """
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+import random
 import time
 import structlog
 
+from api.config.settings import get_settings
+
 logger = structlog.get_logger()
+settings = get_settings()
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """
-    Middleware para logging de requests
+    Middleware ASGI para logging de requests
     """
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
         """
-        Log request y response
+        Log de la request al completarse (una sola línea, muestreada)
         """
-        start_time = time.time()
-        
-        # Log request
-        logger.info(
-            "request_started",
-            method=request.method,
-            path=request.url.path,
-            client=request.client.host if request.client else None
-        )
-        
-        # Process request
-        response = await call_next(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Calculate duration
-        duration = time.time() - start_time
+        start_time = time.perf_counter()
+        status_code = 500
         
-        # Log response
-        logger.info(
-            "request_completed",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
-            duration=f"{duration:.3f}s"
-        )
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
-        return response
+        try:
+            # Process request
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Errores del servidor se loguean siempre; el resto según el muestreo
+            sample_rate = settings.log_sample_rate
+            if status_code >= 500 or sample_rate >= 1.0 or random.random() < sample_rate:
+                # Calculate duration
+                duration_ms = round((time.perf_counter() - start_time) * 1000)
+                client = scope.get("client")
+                
+                # Log response
+                logger.info(
+                    "request_completed",
+                    method=scope["method"],
+                    path=scope["path"],
+                    client=client[0] if client else None,
+                    status_code=status_code,
+                    duration_ms=duration_ms
+                )
@@ -1,39 +1,57 @@
 """
 Database utilities
 """
-from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 import structlog
-from config.settings import get_settings
+from api.config.settings import get_settings
 
 logger = structlog.get_logger()
 settings = get_settings()
 
 # Database engine (se inicializa en init_db)
 engine = None
-SessionLocal = None
+AsyncSessionLocal = None
 Base = declarative_base()
 
 
+def _async_database_url(url: str) -> URL:
+    """
+    Usar el driver asyncpg para URLs de PostgreSQL.
+    asyncpg no acepta "sslmode" de libpq; se traduce a su parámetro "ssl"
+    (acepta los mismos valores: disable, prefer, require, verify-full...)
+    """
+    db_url = make_url(url)
+    
+    if db_url.drivername in ("postgres", "postgresql", "postgresql+psycopg2"):
+        db_url = db_url.set(drivername="postgresql+asyncpg")
+    
+    sslmode = db_url.query.get("sslmode")
+    if sslmode is not None:
+        db_url = db_url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    
+    return db_url
+
+
 async def init_db():
     """
     Initialize database connection
     """
-    global engine, SessionLocal
+    global engine, AsyncSessionLocal
     
     try:
-        engine = create_engine(
-            settings.database_url,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=20
+        engine = create_async_engine(
+            _async_database_url(settings.database_url),
+            pool_recycle=1800,
+            pool_size=20,
+            max_overflow=40
         )
         
-        SessionLocal = sessionmaker(
-            autocommit=False,
+        AsyncSessionLocal = async_sessionmaker(
+            engine,
             autoflush=False,
-            bind=engine
+            expire_on_commit=False
         )
         
         logger.info("database_connected", url=settings.database_url.split("@")[-1] if "@" in settings.database_url else "local")
@@ -51,19 +69,17 @@ async def close_db():
     global engine
     
     if engine:
-        engine.dispose()
+        await engine.dispose()
         logger.info("database_disconnected")
 
 
-def get_db():
+async def get_db():
     """
     Get database session
     """
-    if SessionLocal is None:
-        return None
+    if AsyncSessionLocal is None:
+        yield None
+        return
     
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
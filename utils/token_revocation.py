@@ -0,0 +1,220 @@
+"""
+Revocación de refresh tokens (jti) en Redis con bloom filter local
+
+Se activa con settings.token_revocation_enabled. Si está desactivada, ningún
+token se considera revocado y logout no revoca nada.
+"""
+import asyncio
+from typing import Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError
+from rbloom import Bloom
+import structlog
+
+from api.config.settings import get_settings
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+KEY_PREFIX = "revoked:"
+CHANNEL = "revoked_jti"
+
+# Capacidad del bloom filter (~1.8 MB por proceso con 0.1% de falsos positivos)
+BLOOM_EXPECTED_ITEMS = 1_000_000
+BLOOM_FALSE_POSITIVE_RATE = 0.001
+
+# Cada cuánto se reconstruye el bloom desde Redis (descarta jtis expirados)
+REBUILD_INTERVAL_SECONDS = 15 * 60
+
+# Ping por la conexión pub/sub para detectar conexiones medio abiertas;
+# sin respuesta en PONG_TIMEOUT_SECONDS se reconecta
+HEALTH_CHECK_INTERVAL_SECONDS = 10
+PONG_TIMEOUT_SECONDS = 5
+HEALTH_CHECK_MESSAGE = "revocation-health"
+
+# Espera entre reintentos de suscripción (backoff exponencial)
+RETRY_MIN_SECONDS = 1
+RETRY_MAX_SECONDS = 60
+
+# Se inicializan en init_token_revocation
+redis_client: Optional[aioredis.Redis] = None
+_bloom = Bloom(BLOOM_EXPECTED_ITEMS, BLOOM_FALSE_POSITIVE_RATE)
+_tasks: list = []
+
+# El bloom solo es confiable si se cargó desde Redis y la suscripción sigue
+# activa; mientras tanto toda verificación se resuelve en Redis
+_bloom_loaded = False
+
+# jtis revocados mientras una reconstrucción está en curso
+_revoked_during_rebuild: Optional[set] = None
+_rebuild_lock = asyncio.Lock()
+
+
+def _add_revoked(jti: str):
+    """
+    Agregar un jti al bloom actual y al que se está reconstruyendo
+    """
+    _bloom.add(jti)
+    if _revoked_during_rebuild is not None:
+        _revoked_during_rebuild.add(jti)
+
+
+async def _rebuild_bloom():
+    """
+    Reemplazar el bloom por uno nuevo con todos los jtis revocados en Redis.
+    No lo marca como sincronizado; eso depende de la suscripción (listener).
+    """
+    global _bloom, _revoked_during_rebuild
+
+    async with _rebuild_lock:
+        _revoked_during_rebuild = set()
+        try:
+            bloom = Bloom(BLOOM_EXPECTED_ITEMS, BLOOM_FALSE_POSITIVE_RATE)
+            async for key in redis_client.scan_iter(match=f"{KEY_PREFIX}*", count=1000):
+                bloom.add(key.decode()[len(KEY_PREFIX):])
+
+            # SCAN puede no devolver claves creadas durante el recorrido
+            for jti in _revoked_during_rebuild:
+                bloom.add(jti)
+
+            _bloom = bloom
+        finally:
+            _revoked_during_rebuild = None
+
+
+async def _periodic_rebuild():
+    """
+    Reconstruir el bloom periódicamente con SCAN
+    """
+    while True:
+        await asyncio.sleep(REBUILD_INTERVAL_SECONDS)
+        try:
+            await _rebuild_bloom()
+        except RedisError as e:
+            logger.warning("revocation_bloom_rebuild_failed", error=str(e))
+
+
+async def _listen_revocations():
+    """
+    Agregar al bloom los jtis revocados por otros workers.
+
+    Después de cada suscripción (incluida la inicial) se reconstruye el bloom,
+    para recuperar las revocaciones publicadas mientras no había conexión.
+    Solo aquí se marca el bloom como sincronizado, y se desmarca si la
+    suscripción falla o deja de responder al ping.
+    """
+    global _bloom_loaded
+
+    loop = asyncio.get_running_loop()
+    retry_seconds = RETRY_MIN_SECONDS
+
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(CHANNEL)
+                await _rebuild_bloom()
+                _bloom_loaded = True
+                retry_seconds = RETRY_MIN_SECONDS
+                logger.info("token_revocation_synced")
+
+                last_ping = loop.time()
+                pong_pending = False
+
+                while True:
+                    # Timeout explícito: listen() usaría socket_timeout y
+                    # cortaría la suscripción en cada período sin mensajes
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message:
+                        if message["type"] == "message":
+                            _add_revoked(message["data"].decode())
+                        elif message["type"] == "pong":
+                            pong_pending = False
+
+                    now = loop.time()
+                    if pong_pending and now - last_ping > PONG_TIMEOUT_SECONDS:
+                        raise RedisConnectionError("Sin respuesta al ping de pub/sub")
+                    if not pong_pending and now - last_ping >= HEALTH_CHECK_INTERVAL_SECONDS:
+                        await pubsub.ping(HEALTH_CHECK_MESSAGE)
+                        last_ping = now
+                        pong_pending = True
+        except RedisError as e:
+            _bloom_loaded = False
+            logger.warning("revocation_subscription_failed", error=str(e), retry_in=retry_seconds)
+            await asyncio.sleep(retry_seconds)
+            retry_seconds = min(retry_seconds * 2, RETRY_MAX_SECONDS)
+
+
+async def init_token_revocation():
+    """
+    Conectar a Redis e iniciar la sincronización del bloom
+    """
+    global redis_client
+
+    if not settings.token_revocation_enabled:
+        logger.info("token_revocation_disabled")
+        return
+
+    redis_client = aioredis.from_url(
+        settings.redis_url,
+        socket_connect_timeout=0.5,
+        socket_timeout=0.5,
+    )
+
+    # La carga inicial la hace el listener al suscribirse, reintentando si
+    # Redis no está disponible; no bloquea el arranque de la app
+    _tasks.append(asyncio.create_task(_listen_revocations()))
+    _tasks.append(asyncio.create_task(_periodic_rebuild()))
+
+
+async def close_token_revocation():
+    """
+    Detener la sincronización y cerrar la conexión a Redis
+    """
+    for task in _tasks:
+        task.cancel()
+    _tasks.clear()
+
+    if redis_client:
+        await redis_client.aclose()
+
+
+async def revoke_jti(jti: str, expires_at: int):
+    """
+    Revocar un jti hasta su expiración (epoch en segundos).
+    No hace nada si la revocación no está activa.
+    """
+    if redis_client is None:
+        return
+
+    _add_revoked(jti)
+    await redis_client.set(f"{KEY_PREFIX}{jti}", 1, exat=expires_at)
+    await redis_client.publish(CHANNEL, jti)
+
+
+async def is_jti_revoked(jti: str) -> bool:
+    """
+    Verificar si un jti fue revocado.
+
+    Con el bloom sincronizado, si el jti no está no se consulta Redis. Los
+    positivos, y cualquier jti mientras el bloom no está sincronizado, se
+    verifican en Redis. Una revocación de otro worker puede pasar
+    desapercibida como máximo durante la ventana de detección de una
+    conexión pub/sub caída (HEALTH_CHECK_INTERVAL + PONG_TIMEOUT).
+    """
+    if redis_client is None:
+        return False
+
+    if _bloom_loaded and jti not in _bloom:
+        return False
+
+    try:
+        return await redis_client.exists(f"{KEY_PREFIX}{jti}") > 0
+    except RedisError as e:
+        logger.warning(
+            "revocation_check_failed",
+            jti=jti,
+            error=str(e),
+            fail_closed=settings.token_revocation_fail_closed
+        )
+        return settings.token_revocation_fail_closed